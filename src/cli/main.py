@@ -29,11 +29,6 @@ from slugify import slugify
 
 from src.cli.mytardisconfig import MyTardisEnvConfig
 from src.ingestion_targets.abi_music.crate_builder import ABICrateBuilder
-from src.ingestion_targets.print_lab_genomics.extractor import PrintLabExtractor
-from src.ingestion_targets.print_lab_genomics.ICD11_API_agent import ICD11ApiAgent
-from src.ingestion_targets.print_lab_genomics.print_crate_builder import (
-    PrintLabROBuilder,
-)
 
 # from src.mt_api.api_consts import CONNECTION__HOSTNAME
 from src.mt_api.apiconfigs import AuthConfig, MyTardisRestAgent
@@ -234,6 +229,16 @@ def print_lab(  # pylint: disable=too-many-positional-arguments,too-many-branche
     """
     Create an RO-Crate based on a Print Lab metadata file
     """
+    # imported here so other commands don't pay for loading pandas and openpyxl
+    # pylint: disable=import-outside-toplevel
+    from src.ingestion_targets.print_lab_genomics.extractor import PrintLabExtractor
+    from src.ingestion_targets.print_lab_genomics.ICD11_API_agent import (
+        ICD11ApiAgent,
+    )
+    from src.ingestion_targets.print_lab_genomics.print_crate_builder import (
+        PrintLabROBuilder,
+    )
+
     if tmp_dir:
         tempfile.tempdir = str(tmp_dir)
     output = Path(os.path.abspath(output))
@@ -1,12 +1,13 @@
 """A class that reads in a dataset, experiment and project JSON file and parses
 them into data classes that can be used for creating an RO-crate"""
 
-import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from mytardis_rocrate_builder.rocrate_builder import ROBuilder
 from mytardis_rocrate_builder.rocrate_dataclasses.crate_manifest import CrateManifest
@@ -14,7 +15,6 @@ from mytardis_rocrate_builder.rocrate_dataclasses.rocrate_dataclasses import (
     ContextObject,
     Dataset,
     Experiment,
-    Instrument,
     Project,
 )
 from mytardis_rocrate_builder.rocrate_writer import bagit_crate, write_crate
@@ -22,8 +22,7 @@ from rocrate.rocrate import ROCrate
 from slugify import slugify
 
 from src.ingestion_targets.abi_music.consts import (  # ZARR_DATASET_NAMESPACE,
-    ABI_FACILLITY,
-    ABI_MUSIC_MICROSCOPE_INSTRUMENT,
+    ABI_INSTRUMENT,
 )
 from src.ingestion_targets.abi_music.filesystem_nodes import DirectoryNode, FileNode
 from src.metadata_extraction.metadata_extraction import (
@@ -33,8 +32,12 @@ from src.metadata_extraction.metadata_extraction import (
 )
 from src.mt_api.apiconfigs import MyTardisRestAgent
 from src.mt_api.mt_consts import MtObject
+from src.utils.json_utils import loads as json_loads
 
 datetime_pattern = re.compile("^[0-9]{6}-[0-9]{6}$")
+_match_timestamp = datetime_pattern.match
+# the same project, sample and experiment names recur across many datasets
+_slug = lru_cache(maxsize=4096)(slugify)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -46,10 +49,19 @@ def parse_timestamp(timestamp: str) -> datetime:
 
     Returns a datetime object or raises a ValueError if the string is ill-formed.
     """
-    # strptime is a bit too lenient with its input format, so pre-validate with a regex
-    if _ := datetime_pattern.match(timestamp):
-        return datetime.strptime(timestamp, r"%y%m%d-%H%M%S")
-    raise ValueError("Ill-formed timestamp; expected format 'yymmdd-DDMMSS'")
+    # the regex pins down the layout, so build the datetime from its digits directly;
+    # datetime() still rejects out of range fields
+    if not _match_timestamp(timestamp):
+        raise ValueError("Ill-formed timestamp; expected format 'yymmdd-DDMMSS'")
+    year = int(timestamp[0:2])
+    return datetime(
+        year + (2000 if year < 69 else 1900),  # the same pivot as strptime's %y
+        int(timestamp[2:4]),
+        int(timestamp[4:6]),
+        int(timestamp[7:9]),
+        int(timestamp[9:11]),
+        int(timestamp[11:13]),
+    )
 
 
 def combine_json_files(
@@ -67,8 +79,8 @@ def combine_json_files(
     """
     return_dict = {}
     for file_path in files:
-        with open(file_path, "r", encoding="utf-8") as json_file:
-            json_dict = json.loads(json_file.read())
+        with open(file_path, "rb") as json_file:
+            json_dict = json_loads(json_file.read())
             return_dict.update(json_dict)
     return return_dict
 
@@ -89,13 +101,16 @@ def process_project(
         Project: A project dataclass
     """
     json_dict = read_json(project_dir.file("project.json"))
+    contributor_upis = json_dict["contributors"] or ()
+    # people are cached on the agent, so look them all up concurrently first
+    api_agent.prefetch_people(
+        [str(json_dict["principal_investigator"]), *contributor_upis]
+    )
     principal_investigator = api_agent.create_person_object(
         str(json_dict["principal_investigator"])
     )
     contributors = [
-        api_agent.create_person_object(contributor)
-        for contributor in json_dict["contributors"]
-        if json_dict["contributors"]
+        api_agent.create_person_object(contributor) for contributor in contributor_upis
     ]
     # identifiers: list[str | int | float] = [
     #     slugify(identifier) for identifier in json_dict["project_ids"]
@@ -177,7 +192,7 @@ def process_raw_dataset(
     """
     json_dict = read_json(dataset_dir.file(dataset_dir.name() + ".json"))
     identifiers = [
-        slugify(
+        _slug(
             (
                 f'{json_dict["Basename"]["Project"]}-{json_dict["Basename"]["Sample"]}-'
                 f'{json_dict["Basename"]["Sequence"]}'
@@ -188,7 +203,7 @@ def process_raw_dataset(
     metadata_dict = create_metadata_objects(
         json_dict, metadata_schema, collect_all, identifiers[0]
     )
-    metadata_dict = metadata_dict | create_metadata_objects(
+    metadata_dict |= create_metadata_objects(
         {
             "full-description": json_dict["Description"],
             "sequence-id": json_dict["SequenceID"],
@@ -200,7 +215,7 @@ def process_raw_dataset(
     )
     updated_dates: List[datetime] = []
 
-    if slugify(json_dict["Basename"]["Sample"]) not in experiment_id:
+    if _slug(json_dict["Basename"]["Sample"]) not in experiment_id:
         logger.warning(
             "Experiment ID does not match parent for dataset %s", identifiers[0]
         )
@@ -236,7 +251,7 @@ def process_raw_dataset(
         name=identifiers[0],
         description=json_dict["Description"],
         experiments=(
-            [slugify(f'{json_dict["project_ids"][0]}-{json_dict["experiment_ids"][0]}')]
+            [_slug(f'{json_dict["project_ids"][0]}-{json_dict["experiment_ids"][0]}')]
             if json_dict.get("experiment_ids")
             else [experiment_id]
         ),
@@ -244,15 +259,7 @@ def process_raw_dataset(
         date_created=created_date,
         date_modified=updated_dates or None,
         contributors=None,
-        instrument=Instrument(
-            name=ABI_MUSIC_MICROSCOPE_INSTRUMENT,
-            description=ABI_MUSIC_MICROSCOPE_INSTRUMENT,
-            date_created=None,
-            date_modified=None,
-            location=ABI_FACILLITY,
-            additional_properties={},
-            schema_type="Thing",
-        ),
+        instrument=ABI_INSTRUMENT,
         additional_properties=None,
         schema_type="Dataset",
     )
@@ -291,11 +298,84 @@ def process_nested_contextobj(
 
 def read_json(file: FileNode) -> dict[str, Any]:
     """Extract the JSON data hierachy from `file`"""
-    file_data = file.path().read_text(encoding="utf-8")
-    json_data: dict[str, Any] = json.loads(file_data)
+    json_data: dict[str, Any] = json_loads(file.path().read_bytes())
     return json_data
 
 
+def _closest_marked(
+    directory: DirectoryNode, marked: Dict[Path, List[DirectoryNode]]
+) -> Optional[Path]:
+    return next((path for path in directory.path().parents if path in marked), None)
+
+
+def classify_dirs(
+    raw_dir: DirectoryNode,
+) -> Tuple[
+    List[DirectoryNode],
+    Dict[Path, List[DirectoryNode]],
+    Dict[Path, List[DirectoryNode]],
+]:
+    """Find the project, experiment and dataset directories under raw_dir in one traversal
+
+    Args:
+        raw_dir (DirectoryNode): the root of the raw data
+
+    Returns:
+        Tuple[List[DirectoryNode], Dict[Path, List[DirectoryNode]],
+            Dict[Path, List[DirectoryNode]]]: the project directories,
+            experiment directories keyed by the path of their closest project directory
+            and dataset directories keyed by the path of their closest experiment directory
+    """
+    project_dirs: List[DirectoryNode] = []
+    experiment_dirs: Dict[Path, List[DirectoryNode]] = {}
+    dataset_dirs: Dict[Path, List[DirectoryNode]] = {}
+    # iter_dirs yields every directory before any of its subdirectories
+    for directory in raw_dir.iter_dirs(recursive=True):
+        file_names = directory.file_names()
+        if "experiment.json" in file_names and (
+            project_path := _closest_marked(directory, experiment_dirs)
+        ):
+            experiment_dirs[project_path].append(directory)
+        if f"{directory.name()}.json" in file_names and (
+            experiment_path := _closest_marked(directory, dataset_dirs)
+        ):
+            dataset_dirs[experiment_path].append(directory)
+        if "project.json" in file_names:
+            project_dirs.append(directory)
+            experiment_dirs[directory.path()] = []
+        if "experiment.json" in file_names:
+            dataset_dirs[directory.path()] = []
+    return project_dirs, experiment_dirs, dataset_dirs
+
+
+def _find_datadir(dataset_dir: DirectoryNode) -> Optional[str]:
+    # the dataset's children were already listed when its directory was classified
+    return next(
+        (
+            directory.name()
+            for directory in dataset_dir.directories()
+            if _match_timestamp(directory.name())
+        ),
+        None,
+    )
+
+
+def _write_and_bag(
+    dataset_dir: DirectoryNode, dataset_manifest: CrateManifest, contact_name: str
+) -> None:
+    crate = ROCrate()
+    crate.source = dataset_dir.path()
+    builder = ROBuilder(crate)
+    write_crate(
+        builder=builder,
+        crate_destination=dataset_dir.path(),
+        crate_source=dataset_dir.path(),
+        crate_contents=dataset_manifest,
+    )
+    logging.info("Bagging Crate for: %s", dataset_dir.name())
+    bagit_crate(dataset_dir.path(), contact_name=contact_name)
+
+
 def parse_raw_data(  # pylint: disable=too-many-locals
     raw_dir: DirectoryNode,
     # file_filter: filters.PathFilterSet,
@@ -312,98 +392,78 @@ def parse_raw_data(  # pylint: disable=too-many-locals
     crate_manifest = CrateManifest()
     # project_metadata_schema = metadata_handler.get_mtobj_schema(MtObject.PROJECT)
     # experiment_metadata_schema = metadata_handler.get_mtobj_schema(MtObject.EXPERIMENT)
-    raw_dataset_metadata_schema = MetadataSchema(
-        schema=metadata_handler.get_mtobj_schema(MtObject.DATASET),
-        url=metadata_handler.schema_namespaces.get(MtObject.DATASET) or "",
-    )
-    project_dirs = [
-        d for d in raw_dir.iter_dirs(recursive=True) if d.has_file("project.json")
-    ]
-    for project_dir in project_dirs:
-        logging.info("Project directory: %s", project_dir.name())
-        project = process_project(
-            project_dir=project_dir,
-            # metadata_schema=project_metadata_schema,
-            collect_all=collect_all,
-            api_agent=api_agent,
-        )
-        crate_manifest.add_projects(projects={str(project.id): project})
-
-        experiment_dirs = [
-            d
-            for d in project_dir.iter_dirs(recursive=True)
-            if d.has_file("experiment.json")
-        ]
-
-        for experiment_dir in experiment_dirs:
-            logging.info("Experiment directory: %s", experiment_dir.name())
-
-            experiment = process_experiment(
-                experiment_dir,
-                # metadata_schema=experiment_metadata_schema,
-                parent_project_id=str(project.id),
+    raw_dataset_metadata_schema = metadata_handler.get_metadata_schema(MtObject.DATASET)
+    project_dirs, experiment_dirs, dataset_dirs = classify_dirs(raw_dir)
+    # crates are written and bagged one at a time on this thread, as bagit's make_bag
+    # changes the process wide working directory. Only the dataset JSON is read on
+    # the pool and those reads finish before any of the experiment's crates is bagged
+    with ThreadPoolExecutor() as read_pool:
+        for project_dir in project_dirs:
+            logging.info("Project directory: %s", project_dir.name())
+            project = process_project(
+                project_dir=project_dir,
+                # metadata_schema=project_metadata_schema,
                 collect_all=collect_all,
+                api_agent=api_agent,
             )
-            crate_manifest.add_experiments({str(experiment.id): experiment})
-
-            dataset_dirs = [
-                d
-                for d in experiment_dir.iter_dirs(recursive=True)
-                if d.has_file(d.name() + ".json")
-            ]
-            for dataset_dir in dataset_dirs:
-                logging.info("Dataset directory: %s", dataset_dir.name())
-
-                dataset = process_raw_dataset(
-                    dataset_dir,
-                    raw_dataset_metadata_schema,
-                    experiment_id=str(experiment.id),
-                    collect_all=collect_all,
-                )
+            crate_manifest.add_projects(projects={str(project.id): project})
 
-                data_dir = next(
-                    (
-                        d
-                        for d in dataset_dir.iter_dirs()
-                        if datetime_pattern.match(d.path().stem)
-                    ),
-                    None,
-                )
+            for experiment_dir in experiment_dirs[project_dir.path()]:
+                logging.info("Experiment directory: %s", experiment_dir.name())
 
-                dataset.date_created = (
-                    parse_timestamp(data_dir.name()) if data_dir else None
+                experiment = process_experiment(
+                    experiment_dir,
+                    # metadata_schema=experiment_metadata_schema,
+                    parent_project_id=str(project.id),
+                    collect_all=collect_all,
                 )
-
-                crate_manifest.add_datasets([dataset])
-                if write_datasets and not dataset_dir.has_file("bagit.txt"):
-                    logging.info("Writing Crate for: %s", dataset_dir.name())
-                    projects = {
-                        project_id: crate_manifest.projects[project_id]
-                        for project_id in experiment.projects
-                        if crate_manifest.projects.get(project_id)
-                    }
-                    projects[str(project.id)] = project
-                    dataset_manifest = CrateManifest(
-                        projects={str(project.id): project},
-                        experiments={str(experiment.id): experiment},
-                        datasets=[dataset],
-                        datafiles=None,
-                    )
-                    dataset.directory = Path("./")
-                    dataset.id = "./"
-                    crate = ROCrate()
-                    crate.source = dataset_dir.path()
-                    builder = ROBuilder(crate)
-                    write_crate(
-                        builder=builder,
-                        crate_destination=dataset_dir.path(),
-                        crate_source=dataset_dir.path(),
-                        crate_contents=dataset_manifest,
+                crate_manifest.add_experiments({str(experiment.id): experiment})
+
+                # read and parse the experiment's dataset JSON files concurrently,
+                # every read finishes before the first crate is bagged
+                experiment_dataset_dirs = dataset_dirs[experiment_dir.path()]
+                parsed_datasets = list(
+                    read_pool.map(
+                        partial(
+                            process_raw_dataset,
+                            metadata_schema=raw_dataset_metadata_schema,
+                            experiment_id=str(experiment.id),
+                            collect_all=collect_all,
+                        ),
+                        experiment_dataset_dirs,
                     )
-                    logging.info("Bagging Crate for: %s", dataset_dir.name())
-                    bagit_crate(
-                        dataset_dir.path(),
-                        contact_name=project.principal_investigator.name,
+                )
+                for dataset_dir, dataset in zip(
+                    experiment_dataset_dirs, parsed_datasets
+                ):
+                    logging.info("Dataset directory: %s", dataset_dir.name())
+
+                    data_dir_name = _find_datadir(dataset_dir)
+                    dataset.date_created = (
+                        parse_timestamp(data_dir_name) if data_dir_name else None
                     )
-                    dataset.directory = Path("data") / dataset.directory
+
+                    crate_manifest.add_datasets([dataset])
+                    if write_datasets and "bagit.txt" not in dataset_dir.file_names():
+                        logging.info("Writing Crate for: %s", dataset_dir.name())
+                        projects = {
+                            project_id: crate_manifest.projects[project_id]
+                            for project_id in experiment.projects
+                            if crate_manifest.projects.get(project_id)
+                        }
+                        projects[str(project.id)] = project
+                        dataset_manifest = CrateManifest(
+                            projects={str(project.id): project},
+                            experiments={str(experiment.id): experiment},
+                            datasets=[dataset],
+                            datafiles=None,
+                        )
+                        dataset.directory = Path("./")
+                        dataset.id = "./"
+                        _write_and_bag(
+                            dataset_dir,
+                            dataset_manifest,
+                            project.principal_investigator.name,
+                        )
+                        dataset.directory = Path("data") / dataset.directory
     return crate_manifest
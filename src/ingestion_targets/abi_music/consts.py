@@ -1,6 +1,10 @@
 """Constants for the print lab genomics RO-Crate generator
 """
 
+from mytardis_rocrate_builder.rocrate_dataclasses.rocrate_dataclasses import (
+    Instrument,
+)
+
 from src.mt_api.mt_consts import MtObject
 
 NAMESPACES = {
@@ -13,3 +17,14 @@ NAMESPACES = {
 ABI_MUSIC_MICROSCOPE_INSTRUMENT = "abi-music-microscope-v1"
 ABI_FACILLITY = "ABI music"
 ZARR_DATASET_NAMESPACE = "http://andrew-test.com/datafile/1"
+
+# shared by every raw dataset, so it must not be modified per dataset
+ABI_INSTRUMENT = Instrument(
+    name=ABI_MUSIC_MICROSCOPE_INSTRUMENT,
+    description=ABI_MUSIC_MICROSCOPE_INSTRUMENT,
+    date_created=None,
+    date_modified=None,
+    location=ABI_FACILLITY,
+    additional_properties={},
+    schema_type="Thing",
+)
@@ -29,10 +29,11 @@ class ABICrateBuilder:  # pylint: disable=too-few-public-methods
     def __init__(
         self, api_agent: MyTardisRestAgent, schemas: Optional[SchemaConfig]
     ) -> None:
-        namespaces = profile_consts.NAMESPACES
-        namespaces = load_optional_schemas(namespaces=namespaces, schemas=schemas)
+        namespaces = load_optional_schemas(
+            namespaces=profile_consts.NAMESPACES, schemas=schemas
+        )
         self.api_agent = api_agent
-        self.metadata_handler = MetadataHanlder(api_agent, profile_consts.NAMESPACES)
+        self.metadata_handler = MetadataHanlder(api_agent, namespaces)
 
     def build_crates(self, input_data_source: Path, collect_all: bool) -> CrateManifest:
         """Build crates from datasets found in an ABI directory
@@ -27,23 +27,25 @@ def collect_children(
     files: list[FileNode] = []
     directories: list[DirectoryNode] = []
 
-    for child in directory.path().iterdir():
-        if child.is_file():
-            files.append(
-                FileNode(
-                    child,
-                    parent=directory,
-                    check_exists=False,
+    # scandir entries know their type from the directory listing, avoiding a stat per child
+    with os.scandir(directory.path()) as entries:
+        for entry in entries:
+            if entry.is_file():
+                files.append(
+                    FileNode(
+                        Path(entry.path),
+                        parent=directory,
+                        check_exists=False,
+                    )
                 )
-            )
-        elif child.is_dir():
-            directories.append(
-                DirectoryNode(
-                    child,
-                    parent=directory,
-                    check_exists=False,
+            elif entry.is_dir():
+                directories.append(
+                    DirectoryNode(
+                        Path(entry.path),
+                        parent=directory,
+                        check_exists=False,
+                    )
                 )
-            )
 
     return (files, directories)
 
@@ -120,6 +122,7 @@ class DirectoryNode:
         self._parent = parent
         self._dirs: list[DirectoryNode] | None = None
         self._files: list[FileNode] | None = None
+        self._file_names: frozenset[str] | None = None
         self._sort_entries = sort_entries
 
         if check_exists and not path.is_dir():
@@ -180,6 +183,12 @@ class DirectoryNode:
                 self._dirs.sort(key=lambda dn: dn.path())
         return self._files
 
+    def file_names(self) -> frozenset[str]:
+        """Get the names of all the files in this directory, as listed by files()"""
+        if self._file_names is None:
+            self._file_names = frozenset(file.name() for file in self.files())
+        return self._file_names
+
     def directories(self) -> list[DirectoryNode]:
         """Get a list of all the directories in this directory"""
         if self._dirs is None:
@@ -9,3 +9,41 @@ NAMESPACES = {
     MtObject.DATASET: "http://print.lab.mockup/dataset/as_sample/v1",
     MtObject.DATAFILE: "http://print.lab.mockup/datafile/as_sample/v1",
 }
+
+# the sheets of a print lab datasheet that are read in
+SHEET_NAMES = (
+    "Users",
+    "Projects",
+    "Participants",
+    "Groups",
+    "Samples",
+    "Datasets",
+    "Files",
+)
+
+# source recorded on medical conditions coded with ICD-11
+ICD11_SOURCE = "https://icd.who.int/en"
+
+# (code, text) column pairs of the ICD-11 conditions read from the samples sheet
+DISEASE_COLUMNS = (
+    ("Disease type ICD11 code", "Disease type text from ICD11"),
+    (
+        "Histological diagnosis detail code from ICD11",
+        "Histological diagnosis detail text from ICD11",
+    ),
+)
+ANATOMICAL_SITE_COLUMNS = (
+    "Sample anatomical site ICD11 code",
+    "Sample anatomical site text from ICD11",
+)
+
+# heavily repeated columns, read as categoricals so each distinct value is stored once
+CATEGORICAL_COLUMNS = (
+    "Center",
+    "Instrument",
+    "Project",
+    "Participant",
+    "Participant Sex",
+    "Disease type ICD11 code",
+    "Sample anatomical site ICD11 code",
+)
@@ -5,8 +5,10 @@ Into dataclasses that can be built into an RO-Crate.
 
 import logging
 import os
+from functools import partial
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 from mytardis_rocrate_builder.rocrate_dataclasses.crate_manifest import CrateManifest
@@ -45,6 +47,8 @@ from src.utils.file_utils import is_xslx
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 cwd = os.getcwd()
+# the Rust based calamine reader is much faster than openpyxl, use it when installed
+EXCEL_ENGINE = "calamine" if find_spec("python_calamine") else "openpyxl"
 
 
 class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
@@ -95,12 +99,15 @@ class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
         """
         if not isinstance(input_data_source, Path) or not is_xslx(input_data_source):
             raise ValueError("Print lab genomics file must be an excel file")
-        worksheet_file = pd.ExcelFile(input_data_source, engine="openpyxl")
-        parsed_dfs: Dict[str, pd.DataFrame] = pd.read_excel(
-            worksheet_file,
-            engine="openpyxl",
-            sheet_name=None,
-        )
+        with pd.ExcelFile(input_data_source, engine=EXCEL_ENGINE) as worksheet_file:
+            parsed_dfs: Dict[str, pd.DataFrame] = pd.read_excel(
+                worksheet_file,
+                sheet_name=list(profile_consts.SHEET_NAMES),
+            )
+        for sheet in parsed_dfs.values():
+            for column in profile_consts.CATEGORICAL_COLUMNS:
+                if column in sheet.columns:
+                    sheet[column] = sheet[column].astype("category")
         return parsed_dfs
 
     def _index_acls(
@@ -152,7 +159,7 @@ class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
         self,
         projects_sheet: pd.DataFrame,
     ) -> Dict[str, Project]:
-        def parse_project(row: pd.Series) -> Project:
+        def parse_project(row: Dict[str, Any]) -> Project:
             identifier = slugify(f'{row["Project code"]}')
             pi = self.api_agent.create_person_object(row["Project PI"])
             new_project = Project(
@@ -176,19 +183,26 @@ class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
 
         projects: Dict[str, Project] = {
             project.name: project
-            for project in projects_sheet.apply(parse_project, axis=1).to_list()
+            for project in map(parse_project, projects_sheet.to_dict("records"))
         }
         return projects
 
     def _parse_medical_condition(
         self,
-        row: pd.Series,
+        row: Dict[str, Any],
         code_title: str,
         text_title: str,
-        code_source: str = "https://icd.who.int/en",
+        code_source: str = profile_consts.ICD11_SOURCE,
+        conditions: Optional[Dict[Tuple[Any, str], MedicalCondition]] = None,
     ) -> None | MedicalCondition:
         if not pd.notna(row[code_title]):
             return None
+        key = (row[code_title], code_title)
+        if conditions is not None and (condtion := conditions.get(key)) is not None:
+            # already looked up on an earlier row, only the row needs updating
+            if condtion.code_text is not None:
+                row[text_title] = condtion.code_text
+            return condtion
         condtion = MedicalCondition(
             code=row[code_title],
             code_type=code_title,
@@ -196,6 +210,8 @@ class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
             code_text="",
         )
         condtion = self.icd_11_agent.update_medial_entity_from_ICD11(condtion)
+        if conditions is not None:
+            conditions[key] = condtion
         if condtion.code_text is not None:
             row[text_title] = condtion.code_text
         else:
@@ -209,10 +225,12 @@ class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
         acls: Dict[str, Dict[str, Any]],
         projects: Dict[str, Project],
     ) -> Dict[str, Experiment]:
-        def parse_experiment(row: pd.Series) -> Experiment:
-            row.dropna()
+        # conditions repeat across samples, so each code is only looked up once
+        conditions: Dict[Tuple[Any, str], MedicalCondition] = {}
+        parse_condition = partial(self._parse_medical_condition, conditions=conditions)
+
+        def parse_experiment(row: Dict[str, Any]) -> Experiment:
             participant = particpants_dict[row["Participant"]]
-            disease = []
             project_entity = projects.get(slugify(f'{row["Project"]}'))
             if project_entity is None:
                 logger.error(
@@ -220,24 +238,14 @@ class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
                     row["Sample name"],
                 )
                 raise ValueError()
-            condition = self._parse_medical_condition(
-                row=row,
-                code_title="Disease type ICD11 code",
-                text_title="Disease type text from ICD11",
-            )
-            if condition is not None:
-                disease.append(condition)
-            condition = self._parse_medical_condition(
-                row=row,
-                code_title="Histological diagnosis detail code from ICD11",
-                text_title="Histological diagnosis detail text from ICD11",
-            )
-            if condition is not None:
-                disease.append(condition)
-            anatomical_site = self._parse_medical_condition(
-                row=row,
-                code_title="Sample anatomical site ICD11 code",
-                text_title="Sample anatomical site text from ICD11",
+            disease = [
+                condition
+                for code_title, text_title in profile_consts.DISEASE_COLUMNS
+                if (condition := parse_condition(row, code_title, text_title))
+                is not None
+            ]
+            anatomical_site = parse_condition(
+                row, *profile_consts.ANATOMICAL_SITE_COLUMNS
             )
             new_experiment = SampleExperiment(
                 name=row["Sample name"],
@@ -259,8 +267,7 @@ class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
                 additional_properties={},
                 schema_type="DataCatalog",
             )
-            metadata = row.to_dict()
-            metadata.update(participant.raw_data)
+            metadata = row | participant.raw_data
             metadata_dict = self.metadata_handler.create_metadata_from_schema(
                 input_metadata=metadata,
                 mt_object=MtObject.EXPERIMENT,
@@ -276,9 +283,9 @@ class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
 
         experiments: Dict[str, Experiment] = {
             experiment.name: experiment
-            for experiment in experiments_sheet.apply(
-                parse_experiment, axis=1
-            ).to_list()
+            for experiment in map(
+                parse_experiment, experiments_sheet.to_dict("records")
+            )
         }
         return experiments
 
@@ -286,8 +293,7 @@ class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
         self,
         particpant_sheet: pd.DataFrame,
     ) -> Dict[str, Dataset]:
-        def parse_participant(row: pd.Series) -> Participant:
-            row.dropna()
+        def parse_participant(row: Dict[str, Any]) -> Participant:
             new_participant = Participant(
                 name=row["Participant: Code"],
                 description="",
@@ -312,9 +318,9 @@ class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
 
         participants_dict = {
             participant_value.name: participant_value
-            for participant_value in particpant_sheet.apply(
-                parse_participant, axis=1
-            ).to_list()
+            for participant_value in map(
+                parse_participant, particpant_sheet.to_dict("records")
+            )
         }
         return participants_dict
 
@@ -323,32 +329,35 @@ class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
         dataset_sheet: pd.DataFrame,
         experiments: Dict[str, Experiment],
     ) -> Dict[str, ExtractionDataset]:
-        def parse_dataset(row: pd.Series) -> ExtractionDataset:
-            row.dropna()
+        instruments: Dict[Tuple[Any, Any], Instrument] = {}
+
+        def parse_instrument(name: Any, center: Any) -> Instrument:
             instrument_description = "_".join(
-                [
-                    component
-                    for component in [row["Instrument"], row["Center"]]
-                    if component is not None
-                ]
+                [component for component in [name, center] if component is not None]
             )
+            return Instrument(
+                name=name,
+                location=Facility(
+                    name=center,
+                    description=center,
+                    mt_identifiers=None,
+                    manager_group=Group(name="facility manager group"),
+                ),
+                description=instrument_description,
+                mt_identifiers=None,
+            )
+
+        def parse_dataset(row: Dict[str, Any]) -> ExtractionDataset:
+            key = (row["Instrument"], row["Center"])
+            if (instrument := instruments.get(key)) is None:
+                instrument = instruments[key] = parse_instrument(*key)
             new_dataset = ExtractionDataset(
                 name=row["Dataset Name"],
                 description=row["Dataset Name"],
                 mt_identifiers=[row["Directory"]],
                 experiments=[experiments[row["Sample"]]],
                 directory=Path(row["Directory"]),
-                instrument=Instrument(
-                    name=row["Instrument"],
-                    location=Facility(
-                        name=row["Center"],
-                        description=row["Center"],
-                        mt_identifiers=None,
-                        manager_group=Group(name="facility manager group"),
-                    ),
-                    description=instrument_description,
-                    mt_identifiers=None,
-                ),
+                instrument=instrument,
                 additional_properties={},
                 schema_type="Dataset",
                 copy_unlisted=row["Crate Children"],
@@ -364,7 +373,7 @@ class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
 
         datasets = {
             datasets_value.name: datasets_value
-            for datasets_value in dataset_sheet.apply(parse_dataset, axis=1).to_list()
+            for datasets_value in map(parse_dataset, dataset_sheet.to_dict("records"))
         }
         return datasets
 
@@ -373,7 +382,7 @@ class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
         files_sheet: pd.DataFrame,
         datasets: Dict[str, Dataset],
     ) -> List[Datafile]:
-        def parse_datafile(row: pd.Series) -> Datafile:
+        def parse_datafile(row: Dict[str, Any]) -> Datafile:
             new_datafile = Datafile(
                 name=Path(row["Filepath"]),
                 description=row["Description"],
@@ -391,7 +400,9 @@ class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
             self.collected_metadata.extend(metadata_dict.values())
             return new_datafile
 
-        datafiles: List[Datafile] = files_sheet.apply(parse_datafile, axis=1).to_list()
+        datafiles: List[Datafile] = [
+            parse_datafile(row) for row in files_sheet.to_dict("records")
+        ]
         return datafiles
 
     def _parse_users(
@@ -422,7 +433,7 @@ class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
                 new_user.mt_identifiers.append(row["Identifier"])
             return new_user
 
-        users: List[User] = users_sheet.apply(parse_user, axis=1).to_list()
+        users: List[User] = [parse_user(row) for row in users_sheet.to_dict("records")]
         return users
 
     def extract(self, input_data_source: Any) -> CrateManifest:
@@ -442,7 +453,12 @@ class PrintLabExtractor:  # pylint: disable = too-many-instance-attributes
         data_df = self.datasheet_to_dataframes(
             input_data_source,
         )
+        # every object type's schema is used below, so request them together
+        self.metadata_handler.prefetch_schemas()
         self.users.extend(self._parse_users(data_df["Users"]))
+        self.api_agent.prefetch_people(
+            data_df["Projects"]["Project PI"].dropna().unique()
+        )
         projects = self._parse_projects(projects_sheet=data_df["Projects"])
         participants = self._parse_participants(data_df["Participants"])
         acls = self._index_acls(data_df["Groups"])
@@ -13,6 +13,7 @@ from rocrate.model.contextentity import ContextEntity
 from rocrate.model.encryptedcontextentity import (  # pylint: disable=import-error, no-name-in-module
     EncryptedContextEntity,
 )
+from rocrate.rocrate import ROCrate
 from slugify import slugify
 
 from src.ingestion_targets.print_lab_genomics.print_crate_dataclasses import (
@@ -24,6 +25,8 @@ from src.ingestion_targets.print_lab_genomics.print_crate_dataclasses import (
 
 logger = logging.getLogger(__name__)
 
+PARTICIPANT_TYPE = ("Person", "MedicalEntity", "Patient")
+
 
 class PrintLabROBuilder(ROBuilder):  # type: ignore
     """Specific RO-Crate builder for print-lab dataclasses
@@ -32,6 +35,12 @@ class PrintLabROBuilder(ROBuilder):  # type: ignore
         ROBuilder: extends ROBuilder
     """
 
+    def __init__(self, crate: ROCrate) -> None:
+        super().__init__(crate)
+        # entities added by this builder keyed by id, checked before the crate
+        # as crate.dereference resolves the id against the crate's base URI on every call
+        self._entities: Dict[str, ContextEntity] = {}
+
     def _add_participant_sensitve(
         self, participant: Participant, participant_id: str
     ) -> Any:
@@ -77,7 +86,9 @@ class PrintLabROBuilder(ROBuilder):  # type: ignore
             ContextEntity: a context entity representing the medical condition
         """
         identifier = medical_condition.roc_id
-        if condition := self.crate.dereference(identifier):
+        if condition := self._entities.get(identifier) or self.crate.dereference(
+            identifier
+        ):
             return condition
         properties: Dict[str, str | list[str] | dict[str, Any]] = {
             "@type": "MedicalCondition",
@@ -92,7 +103,7 @@ class PrintLabROBuilder(ROBuilder):  # type: ignore
         )
         if medical_condition.code_text:
             medical_condition_obj.append_to("code_text", medical_condition.code_text)
-        self.crate.add(medical_condition_obj)
+        self._entities[identifier] = self.crate.add(medical_condition_obj)
         return medical_condition_obj
 
     def add_participant(
@@ -111,10 +122,13 @@ class PrintLabROBuilder(ROBuilder):  # type: ignore
         """
 
         identifier = participant.roc_id
-        if participant_obj := self.crate.dereference(identifier):
+        if participant_obj := self._entities.get(identifier) or self.crate.dereference(
+            identifier
+        ):
             return participant_obj
         properties: Dict[str, str | list[str] | dict[str, Any]] = {
-            "@type": ["Person", "MedicalEntity", "Patient"],
+            # a new list per participant, rocrate's append_to extends lists in place
+            "@type": list(PARTICIPANT_TYPE),
             "name": participant.name,
             "description": participant.description,
             "project": participant.project,
@@ -132,11 +146,12 @@ class PrintLabROBuilder(ROBuilder):  # type: ignore
                 properties=properties,
             )
             recipients = [
-                self.crate.dereference(participant.user.rocid) or self.add_user(user)
+                self.crate.dereference(user.roc_id) or self.add_user(user)
                 for user in participant.recipients
             ]
             participant_obj.append_to("encryptedTo", recipients)
-            return self.crate.add(participant_obj)
+            self._entities[identifier] = self.crate.add(participant_obj)
+            return self._entities[identifier]
 
         participant_obj = ContextEntity(
             self.crate,
@@ -150,7 +165,8 @@ class PrintLabROBuilder(ROBuilder):  # type: ignore
                 "sensitive",
                 self._add_participant_sensitve(participant, str(participant.id)),
             )
-        return self.crate.add(participant_obj)
+        self._entities[identifier] = self.crate.add(participant_obj)
+        return self._entities[identifier]
 
     def add_experiment(self, experiment: Experiment) -> ContextEntity:
         """Add a sample experiment to the RO crate
@@ -167,19 +183,20 @@ class PrintLabROBuilder(ROBuilder):  # type: ignore
             "analyate": experiment.analyate if experiment.analyate else "",
             "description": experiment.description,
         }
-        projects = []
-        for project in experiment.projects:
-            if crate_project := self.crate.dereference(project.roc_id):
-                projects.append(crate_project)
-            else:
-                projects.append(self.add_project(project))
+        dereference = self.crate.dereference
+        add_project = self.add_project
+        projects = [
+            dereference(project.roc_id) or add_project(project)
+            for project in experiment.projects
+        ]
         experiment_obj = self._update_experiment_meta(
             experiment=experiment, properties=properties, projects=projects
         )
 
+        add_medical_condition = self.add_medical_condition
         associated_diseases = (
             [
-                self.add_medical_condition(condition)
+                add_medical_condition(condition)
                 for condition in experiment.associated_disease
             ]
             if experiment.associated_disease
@@ -1,8 +1,14 @@
 """Metadata conversion and generation"""
 
+import hashlib
+import json
 import logging
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from mytardis_rocrate_builder.rocrate_dataclasses.rocrate_dataclasses import (
     MTMetadata,
@@ -13,28 +19,45 @@ from requests.exceptions import RequestException
 from src.cli.mytardisconfig import SchemaConfig
 from src.mt_api.apiconfigs import MyTardisRestAgent
 from src.mt_api.mt_consts import MtObject
-
-MT_METADATA_TYPE = {
-    1: "NUMERIC",
-    2: "STRING",
-    3: "URL",
-    4: "LINK",
-    5: "FILENAME",
-    6: "DATETIME",
-    7: "LONGSTRING",
-    8: "JSON",
-    "default": "STRING",
-}
+from src.utils.json_utils import loads as json_loads
+
+# indexed by the MyTardis data_type enum (1-8), index 0 is the default type
+MT_METADATA_TYPE = (
+    "STRING",
+    "NUMERIC",
+    "STRING",
+    "URL",
+    "LINK",
+    "FILENAME",
+    "DATETIME",
+    "LONGSTRING",
+    "JSON",
+)
+# type and sensitivity of metadata collected without a schema entry
+DEFAULT_FIELD = (MT_METADATA_TYPE[0], False)
+SCHEMA_CACHE_DIR = Path.home() / ".cache" / "mytardis_ingestion" / "schemas"
+SCHEMA_CACHE_TTL = 24 * 60 * 60
 logger = logging.getLogger(__name__)
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class MetadataSchema:
     """A class for holding bundled information about a metadata schema"""
 
     schema: Dict[str, Dict[str, Any]]
     url: str
     mt_type: Optional[MtObject] = None
+    fields: Dict[str, Tuple[str, bool]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # data type and sensitivity are all that is read from a schema object
+        self.fields = {
+            name: (
+                get_metadata_type(int(schema_object.get("data_type") or 2)),
+                bool(schema_object.get("sensitive")),
+            )
+            for name, schema_object in self.schema.items()
+        }
 
 
 def get_metadata_type(type_enum: int) -> str:
@@ -47,21 +70,25 @@ def get_metadata_type(type_enum: int) -> str:
     Returns:
         str: the metadata type as a string
     """
-    if MT_METADATA_TYPE.get(type_enum) is not None:
+    if 0 < type_enum < len(MT_METADATA_TYPE):
         return MT_METADATA_TYPE[type_enum]
-    return MT_METADATA_TYPE["default"]
+    return MT_METADATA_TYPE[0]
 
 
 class MetadataHanlder:
     """Class for loading metadata schemas and creating metadata RO-Crate objects
 
     api_agenent MyTardisRestAgent: the api_agnet for making requests for the schemas
+    schema_cache_dir Optional[Path]: where fetched schemas are cached, None disables caching
+    cache_ttl_seconds int: how long a cached schema is used before it is requested again
     """
 
     api_agent: MyTardisRestAgent
     metadata_schemas: Dict[MtObject, Dict[Any, Any]]
-    metadata_collected: Dict[str, MTMetadata] = {}
+    metadata_collected: Dict[str, MTMetadata]
     pubkey_fingerprints: Optional[List[str]] = None
+    schema_cache_dir: Optional[Path] = SCHEMA_CACHE_DIR
+    cache_ttl_seconds: int = SCHEMA_CACHE_TTL
 
     def __init__(
         self,
@@ -70,10 +97,18 @@ class MetadataHanlder:
     ):
         self.api_agent = api_agent
         self.schema_namespaces = schema_namespaces
-        self.request_metadata_dicts(schema_namespaces)
+        self.metadata_schemas = {}
+        self.metadata_collected = {}
+        self._schemas_by_object: Dict[MtObject, MetadataSchema] = {}
+
+    def clear_collected(self) -> None:
+        """Release all metadata collected by this handler so far"""
+        self.metadata_collected = {}
 
     def request_metadata_schema(self, schema_namespace: str) -> Dict[Any, Any]:
-        """Requests a metadata schema from the MyTardis API based on namespace
+        """Requests a metadata schema from the MyTardis API based on namespace.
+        A stale cached schema is revalidated with its ETag/Last-Modified
+        and reused if MyTardis reports it is unchanged
 
         Args:
             schema_namespace (str): the namespace of hte requested schema
@@ -81,53 +116,166 @@ class MetadataHanlder:
         Returns:
             Dict[Any, Any]: the metadata schema as a dictionary keyed on its' "full name"
         """
-        schema_stub = "schema/?namespace="
-        metadata_params = []
+        cached = self._read_cache_entry(schema_namespace) or {}
+        if cached and time.time() - cached["fetched_at"] <= self.cache_ttl_seconds:
+            fresh_schema: Dict[Any, Any] = cached["schema"]
+            return fresh_schema
+        revalidate_headers = {
+            header: cached[key]
+            for key, header in (
+                ("etag", "If-None-Match"),
+                ("last_modified", "If-Modified-Since"),
+            )
+            if cached.get(key)
+        }
+        schema_stub = "schema/"
+        metadata_schema: Dict[Any, Any] = {}
+        etag: Optional[str] = None
+        last_modified: Optional[str] = None
         try:
             response = self.api_agent.no_auth_request(
-                "GET", self.api_agent.api_template + schema_stub + schema_namespace
+                "GET",
+                self.api_agent.api_template + schema_stub,
+                params={"namespace": schema_namespace},
+                extra_headers=revalidate_headers or None,
             )
-            metadata_response = [
-                response_obj.get("parameter_names")
-                for response_obj in response.json().get("objects")
-            ]
-            metadata_params = [
-                metatdata_parameters
-                for params in metadata_response
-                for metatdata_parameters in params
-            ]
+            if response.status_code == 304:
+                # unchanged since it was cached, so there is nothing to parse
+                metadata_schema = cached.get("schema", {})
+                etag = response.headers.get("ETag") or cached.get("etag")
+                last_modified = cached.get("last_modified")
+            else:
+                metadata_schema = {
+                    schema_object.get("name"): schema_object
+                    for schema_object in chain.from_iterable(
+                        response_obj.get("parameter_names", [])
+                        for response_obj in response.json().get("objects", [])
+                    )
+                }
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
         except RequestException as e:
+            if stale_schema := cached.get("schema"):
+                # left stale in the cache so it is revalidated on the next request
+                logger.warning(
+                    "bad API response revalidating Metadata schema %s: %s \n"
+                    " using the cached schema",
+                    schema_namespace,
+                    e,
+                )
+                return dict(stale_schema)
             logger.error(
                 "bad API response getting Metadata schema %s: %s \n NO METADATA WILL BE READ",
                 schema_namespace,
                 e,
             )
+        if metadata_schema:
+            self._write_cached_schema(
+                schema_namespace, metadata_schema, etag, last_modified
+            )
+        return metadata_schema
 
-        return {
-            schema_object.get("name"): schema_object
-            for schema_object in metadata_params
-        }
+    def _schema_cache_file(self, schema_namespace: str) -> Optional[Path]:
+        if not self.schema_cache_dir:
+            return None
+        key = hashlib.sha1(schema_namespace.encode(), usedforsecurity=False)
+        return self.schema_cache_dir / f"{key.hexdigest()}.json"
+
+    def _read_cache_entry(self, schema_namespace: str) -> Optional[Dict[str, Any]]:
+        """Read the cache entry of a schema previously fetched from this MyTardis host
+
+        Args:
+            schema_namespace (str): the namespace of the requested schema
+
+        Returns:
+            Optional[Dict[str, Any]]: the cached schema, when it was fetched and its
+                ETag/Last-Modified validators. None if the schema must be requested
+        """
+        cache_file = self._schema_cache_file(schema_namespace)
+        if cache_file is None or not cache_file.is_file():
+            return None
+        try:
+            cached: Dict[str, Any] = json_loads(cache_file.read_bytes())
+        except (OSError, ValueError) as e:
+            logger.warning("discarding unreadable cached schema %s: %s", cache_file, e)
+            cache_file.unlink(missing_ok=True)
+            return None
+        if cached.get("hostname") != str(self.api_agent.hostname) or not cached.get(
+            "schema"
+        ):
+            return None
+        cached.setdefault("fetched_at", 0)
+        return cached
+
+    def _write_cached_schema(
+        self,
+        schema_namespace: str,
+        metadata_schema: Dict[Any, Any],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        cache_file = self._schema_cache_file(schema_namespace)
+        if cache_file is None:
+            return
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(
+                json.dumps(
+                    {
+                        "schema": metadata_schema,
+                        "fetched_at": time.time(),
+                        "hostname": str(self.api_agent.hostname),
+                        "etag": etag,
+                        "last_modified": last_modified,
+                    }
+                ),
+                encoding="utf-8",
+            )
+        except (OSError, TypeError) as e:
+            logger.warning("could not cache schema %s: %s", schema_namespace, e)
 
     def request_metadata_dicts(
         self, schema_namespaces: Dict[MtObject, str]
     ) -> Dict[MtObject, Dict[Any, Any]]:
-        """Load a set of schemas via the MyTardis API based on namespaces
+        """Load a set of schemas via the MyTardis API based on namespaces,
+        replacing any already loaded for those objects.
+        Each distinct namespace is requested once, concurrently with the others
 
         Args:
             schema_namespaces (Dict[MtObject, str]):
              A dictionary of Metadata namespaces corresponding to MyTardis objects
 
         Returns:
-            Dict[MtObject, list[Any]]: metadata schemas for creating RO-Crate objects
+            Dict[MtObject, Dict[Any, Any]]: metadata schemas for creating RO-Crate objects
         """
-        metadata_schemas = {}
-        for mt_object, namespace in schema_namespaces.items():
-            metadata_schemas[mt_object] = self.request_metadata_schema(namespace)
-        self.metadata_schemas = metadata_schemas
+        namespaces = list(dict.fromkeys(schema_namespaces.values()))
+        with ThreadPoolExecutor(max_workers=max(len(namespaces), 1)) as executor:
+            schemas_by_namespace = dict(
+                zip(namespaces, executor.map(self.request_metadata_schema, namespaces))
+            )
+        metadata_schemas = {
+            mt_object: schemas_by_namespace[namespace]
+            for mt_object, namespace in schema_namespaces.items()
+        }
+        self.metadata_schemas.update(metadata_schemas)
+        for mt_object in metadata_schemas:
+            self._schemas_by_object.pop(mt_object, None)
         return metadata_schemas
 
+    def prefetch_schemas(self) -> None:
+        """Concurrently request every schema this handler has a namespace for
+        that has not been loaded yet"""
+        missing = {
+            mt_object: namespace
+            for mt_object, namespace in self.schema_namespaces.items()
+            if namespace and mt_object not in self.metadata_schemas
+        }
+        if missing:
+            self.request_metadata_dicts(missing)
+
     def get_mtobj_schema(self, schema_name: MtObject) -> Dict[str, Dict[str, Any]]:
-        """Convert a metadata schema into a lookup dictonary using the full name of the metadata
+        """Get the lookup dictonary of a metadata schema, keyed by the full name of the metadata.
+        Schemas are requested the first time they are needed
 
         Args:
             schema_name (MtObject): which mytardis object schema based on the schema dictonary
@@ -135,10 +283,31 @@ class MetadataHanlder:
         Returns:
              Dict[str, Dict[str, Any]]: a dictionary of metadata elements keyed by their full name
         """
-        all_schema_objects = self.metadata_schemas.get(schema_name)
-        if not all_schema_objects:
-            return {}
-        return all_schema_objects
+        if schema_name not in self.metadata_schemas:
+            namespace = self.schema_namespaces.get(schema_name)
+            self.metadata_schemas[schema_name] = (
+                self.request_metadata_schema(namespace) if namespace else {}
+            )
+        return self.metadata_schemas[schema_name]
+
+    def get_metadata_schema(self, mt_object: MtObject) -> MetadataSchema:
+        """Get the prepared metadata schema of a MyTardis object type.
+        Built once per object type and rebuilt whenever the schemas are reloaded
+
+        Args:
+            mt_object (MtObject): which mytardis object schema based on the schema dictonary
+
+        Returns:
+            MetadataSchema: the schema, its namespace and its field lookup
+        """
+        if (metadata_schema := self._schemas_by_object.get(mt_object)) is None:
+            metadata_schema = MetadataSchema(
+                schema=self.get_mtobj_schema(mt_object),
+                url=self.schema_namespaces.get(mt_object) or "",
+                mt_type=mt_object,
+            )
+            self._schemas_by_object[mt_object] = metadata_schema
+        return metadata_schema
 
     def create_metadata_from_schema(
         self,
@@ -158,14 +327,11 @@ class MetadataHanlder:
         Returns:
             Dict[str, MTMetadata]: all the metadata collected
         """
-        metadata_schema = MetadataSchema(
-            schema=self.get_mtobj_schema(mt_object),
-            url=self.schema_namespaces.get(mt_object) or "",
-            mt_type=mt_object,
-        )
+        if not (collect_all or self.get_mtobj_schema(mt_object)):
+            return {}
         metadata_dict = create_metadata_objects(
             input_metadata=input_metadata,
-            metadata_schema=metadata_schema,
+            metadata_schema=self.get_metadata_schema(mt_object),
             collect_all=collect_all,
             parent=parent,
         )
@@ -188,26 +354,28 @@ def create_metadata_objects(
     Returns:
         Dict[str, MTMetadata]: RO-Crate metadata objects for stroing MyTardis metadata
     """
-    metadata_dict: Dict[str, MTMetadata] = {}
-    for meta_key, meta_value in input_metadata.items():
-        if (meta_key and meta_value) and (
-            collect_all or meta_key in metadata_schema.schema
-        ):
-            # if we have metadata and the info to store it
-            metadata_type = 2
-            metadata_sensitive = False
-            if metadata_object := metadata_schema.schema.get(meta_key):
-                metadata_type = metadata_object.get("data_type")  # type: ignore
-                metadata_sensitive = bool(metadata_object.get("sensitive"))
-            metadata_dict[meta_key] = MTMetadata(
-                name=meta_key,
-                value=str(meta_value),  # if metadata_type == 2 else meta_value,
-                mt_type=get_metadata_type(int(metadata_type)),
-                mt_schema=metadata_schema.url,
-                sensitive=metadata_sensitive,
-                parent=parent if parent else None,
-            )
-    return metadata_dict
+    fields = metadata_schema.fields
+    # len() rather than truthiness as input_metadata may be a pandas Series
+    if len(input_metadata) == 0 or not (collect_all or fields):
+        return {}
+    url = metadata_schema.url
+    # fields missing from the schema are only kept when collecting everything
+    default_field = DEFAULT_FIELD if collect_all else None
+    # only keep metadata that has a value and the info to store it
+    return {
+        meta_key: MTMetadata(
+            name=meta_key,
+            value=str(meta_value),
+            mt_type=field_info[0],
+            mt_schema=url,
+            sensitive=field_info[1],
+            parent=parent,
+        )
+        for meta_key, meta_value in input_metadata.items()
+        if meta_key and meta_value
+        for field_info in (fields.get(meta_key, default_field),)
+        if field_info
+    }
 
 
 def load_optional_schemas(
@@ -220,20 +388,18 @@ def load_optional_schemas(
         schemas (SchemaConfig): namespaces loaded via a schemaConfig
 
     Returns:
-        Dict[MtObject, str]: default schema namespaces now updated with those from config
+        Dict[MtObject, str]: a copy of the default schema namespaces
+            updated with those from config
     """
     if not schemas:
-        return namespaces
-    namespaces[MtObject.PROJECT] = (
-        schemas.project if schemas.project else namespaces[MtObject.PROJECT]
-    )
-    namespaces[MtObject.EXPERIMENT] = (
-        schemas.experiment if schemas.experiment else namespaces[MtObject.EXPERIMENT]
-    )
-    namespaces[MtObject.DATASET] = (
-        schemas.dataset if schemas.dataset else namespaces[MtObject.DATASET]
-    )
-    namespaces[MtObject.DATAFILE] = (
-        schemas.datafile if schemas.datafile else namespaces[MtObject.DATAFILE]
-    )
-    return namespaces
+        return dict(namespaces)
+    overrides = {
+        MtObject.PROJECT: schemas.project,
+        MtObject.EXPERIMENT: schemas.experiment,
+        MtObject.DATASET: schemas.dataset,
+        MtObject.DATAFILE: schemas.datafile,
+    }
+    return {
+        mt_object: overrides.get(mt_object) or namespace
+        for mt_object, namespace in namespaces.items()
+    }
@@ -3,7 +3,8 @@ Currently used to request and validate schemas by the extractor.
 """
 
 import logging
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
 from urllib.parse import urljoin
 
 import backoff
@@ -11,9 +12,11 @@ import requests
 from mytardis_rocrate_builder.rocrate_dataclasses.rocrate_dataclasses import Person
 from pydantic import BaseModel
 from requests import Response
+from requests.adapters import HTTPAdapter
 from requests.auth import AuthBase
 from requests.exceptions import RequestException
 from requests.models import PreparedRequest
+from urllib3.util.retry import Retry
 
 from src.mt_api.api_consts import CONNECTION__HOSTNAME
 
@@ -81,7 +84,8 @@ class ApiProxy(BaseModel):
     https: Optional[str] = None
 
 
-class MyTardisRestAgent:  # pylint: disable=R0903, R0913
+# R0902: the session, its settings and the people cache all live on the agent
+class MyTardisRestAgent:  # pylint: disable=R0902, R0903, R0913
     """Class for handling requests to MyTardis API
 
     Raises:
@@ -93,6 +97,7 @@ class MyTardisRestAgent:  # pylint: disable=R0903, R0913
     _api_stub: str = "/api/v1/"
 
     auth: AuthConfig = AuthConfig(username="", api_key="")
+    pool_size: int = 32
     user_agent_name: str = __name__
     user_agent_url: str = "https://github.com/UoA-eResearch/ro_crate_mt_ingestions"
 
@@ -119,6 +124,24 @@ class MyTardisRestAgent:  # pylint: disable=R0903, R0913
         self.api_template = urljoin(self.hostname, self._api_stub)
         self.user_agent = f"{self.user_agent_name}/2.0 ({self.user_agent_url})"
         self._session = requests.Session()
+        # 502s are left to the BadGateWayException backoff in mytardis_api_request
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(503, 504),
+                raise_on_status=False,
+            ),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._people: Dict[str, Person] = {}
+
+    def clear_cache(self) -> None:
+        """Forget any people already looked up by this agent"""
+        self._people.clear()
 
     @backoff.on_exception(backoff.expo, BadGateWayException, max_tries=8)
     def mytardis_api_request(  # pylint: disable=R0903, R0913
@@ -184,7 +207,8 @@ class MyTardisRestAgent:  # pylint: disable=R0903, R0913
         return response
 
     def create_person_object(self, upi: str) -> Person:
-        """Look up a UPI and create a Person entry from the results
+        """Look up a UPI and create a Person entry from the results.
+        Successful lookups are cached so each UPI is only requested once per agent
 
         Args:
             upi (str): The UPI for the person
@@ -195,14 +219,18 @@ class MyTardisRestAgent:  # pylint: disable=R0903, R0913
         Raises:
             ValueError: If the UPI can't be found
         """
-        users_stub = "user/?username="
+        if person := self._people.get(upi):
+            return person
+        users_stub = "user/"
         name = upi
         email = ""
+        found = False
         try:
             response = self.mytardis_api_request(
-                "GET", self.api_template + users_stub + upi
+                "GET", self.api_template + users_stub, params={"username": upi}
             )
             if response.status_code == 200:
+                found = True
                 if response_data := response.json().get("objects"):
                     name = (
                         response_data[0].get("first_name")
@@ -224,21 +252,43 @@ class MyTardisRestAgent:  # pylint: disable=R0903, R0913
                 "bad API response getting person data for %s. Error: %s.", upi, e
             )
 
-        return Person(name=name, email=email, affiliation=UOA, mt_identifiers=[upi])
+        person = Person(name=name, email=email, affiliation=UOA, mt_identifiers=[upi])
+        if found:
+            self._people[upi] = person
+        return person
+
+    def prefetch_people(self, upis: Iterable[str], max_workers: int = 16) -> None:
+        """Look up a set of UPIs concurrently so that later calls to
+        create_person_object are answered from the cache
 
-    def no_auth_request(
+        Args:
+            upis (Iterable[str]): the UPIs that will be looked up
+            max_workers (int, optional): maximum concurrent requests. Defaults to 16.
+        """
+        to_fetch = {upi for upi in upis if upi and upi not in self._people}
+        if not to_fetch:
+            return
+        with ThreadPoolExecutor(
+            max_workers=min(len(to_fetch), max_workers)
+        ) as executor:
+            list(executor.map(self.create_person_object, to_fetch))
+
+    def no_auth_request(  # pylint: disable=R0913
         self,
         method: str,
         url: str,
         params: Optional[Dict[str, str]] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
     ) -> requests.Response:
         """Make a request to the MyTardis API without requiring authentication.
         Mainly used for GET requests to non-sensitive data that don't requaire AUTH
+        Responses are not cached here, the schema handler keeps its own revalidated cache
 
         Args:
             method (str): the REST API method
             url (str): the hostname URL with API request
             params (Optional[Dict[str, str]], optional): additional parameters
+            extra_headers (Optional[Dict[str, str]], optional): extra headers for the request
 
         Returns:
             A requests.Response object
@@ -254,7 +304,9 @@ class MyTardisRestAgent:  # pylint: disable=R0903, R0913
             "Content-Type": "application/json",
             "User-Agent": self.user_agent,
         }
-        response = requests.request(
+        if extra_headers:
+            headers = {**headers, **extra_headers}
+        response = self._session.request(
             method,
             url,
             params=params,
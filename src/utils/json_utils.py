@@ -0,0 +1,22 @@
+"""
+    Utilities for decoding JSON, using orjson when it is installed
+"""
+
+import json
+import logging
+from typing import Any, Callable
+
+loads: Callable[[bytes | str], Any]
+try:
+    import orjson
+
+    loads = orjson.loads
+    HAS_ORJSON = True
+except ImportError:
+    loads = json.loads
+    HAS_ORJSON = False
+
+logger = logging.getLogger(__name__)
+logger.debug("decoding JSON with %s", "orjson" if HAS_ORJSON else "the json module")
+
+__all__ = ["HAS_ORJSON", "loads"]
@@ -5,7 +5,10 @@ Taken wholesale from the MyTardis ingestion logging utils, thanks Andrew.
 
 import logging
 import sys
-from typing import Optional
+from typing import List, Optional
+
+# handlers attached by init_logging, replaced rather than stacked on repeat calls
+_HANDLERS: List[logging.Handler] = []
 
 
 def init_logging(file_name: Optional[str] = None, level: int = logging.DEBUG) -> None:
@@ -15,14 +18,22 @@ def init_logging(file_name: Optional[str] = None, level: int = logging.DEBUG) ->
     """
     root = logging.getLogger()
     root.setLevel(level)
+    for handler in _HANDLERS:
+        root.removeHandler(handler)
+        handler.close()
+    _HANDLERS.clear()
+    formatter = logging.Formatter("[%(levelname)s]: %(message)s")
 
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
-    console_handler.setFormatter(logging.Formatter("[%(levelname)s]: %(message)s"))
-    root.addHandler(console_handler)
+    console_handler.setFormatter(formatter)
+    _HANDLERS.append(console_handler)
 
     if file_name:
         file_handler = logging.FileHandler(filename=file_name, mode="w")
         file_handler.setLevel(level)
-        file_handler.setFormatter(logging.Formatter("[%(levelname)s]: %(message)s"))
-        root.addHandler(file_handler)
+        file_handler.setFormatter(formatter)
+        _HANDLERS.append(file_handler)
+
+    for handler in _HANDLERS:
+        root.addHandler(handler)
@@ -3,9 +3,10 @@
 import pathlib
 import random
 import shutil
+import string
 from datetime import datetime
 from sys import platform
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 import slugify
@@ -18,7 +19,7 @@ from mytardis_rocrate_builder.rocrate_dataclasses.rocrate_dataclasses import (
     Project,
     User,
 )
-from pytest import fixture
+from pytest import MonkeyPatch, fixture
 from rocrate.model import ContextEntity as ROContextEntity
 from rocrate.model import EncryptedContextEntity as ROEncryptedContextEntity
 from rocrate.rocrate import ROCrate
@@ -31,7 +32,10 @@ from src.ingestion_targets.print_lab_genomics.print_crate_dataclasses import (
     Participant,
     SampleExperiment,
 )
-from src.metadata_extraction.metadata_extraction import MetadataSchema
+from src.metadata_extraction.metadata_extraction import (
+    MetadataHanlder,
+    MetadataSchema,
+)
 from src.mt_api.apiconfigs import AuthConfig
 from src.mt_api.mt_consts import UOA, MtObject
 
@@ -62,12 +66,27 @@ def test_ingestion_project() -> pd.DataFrame:
     return pd.DataFrame(projects_data)
 
 
-def fake_upi(faker: Faker) -> str:
-    return faker.bothify(text="????###", letters="abcdefghijklmnopqrstuvwxyz")
+def batch_bothify(
+    text: str, n_rows: int, letters: str = string.ascii_letters
+) -> List[Optional[str]]:
+    "fill a faker bothify pattern for every row at once, one draw per character"
+
+    def draw(char: str) -> List[str]:
+        if char == "?":
+            return random.choices(letters, k=n_rows)
+        if char == "#":
+            return random.choices(string.digits, k=n_rows)
+        return [char] * n_rows
+
+    return ["".join(row) for row in zip(*map(draw, text))]
 
 
-def fake_icd11(faker: Faker) -> str:
-    return faker.bothify(text="#?##.##", letters="ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+def fake_upis(n_rows: int) -> List[Optional[str]]:
+    return batch_bothify("????###", n_rows, string.ascii_lowercase)
+
+
+def fake_icd11s(n_rows: int) -> List[Optional[str]]:
+    return batch_bothify("#?##.##", n_rows, string.ascii_uppercase)
 
 
 def fake_national_health_index(faker: Faker) -> str | None:
@@ -81,188 +100,178 @@ def fake_national_health_index(faker: Faker) -> str | None:
     )
 
 
+def optional(values: List[Any]) -> List[Any]:
+    "blank out about half of the values, as in an optional column of a sheet"
+    keep = random.choices((True, False), k=len(values))
+    return [value if kept else None for value, kept in zip(values, keep)]
+
+
 def fake_groups_list(faker: Faker, num_groups: int) -> List[str]:
     "generate a fake comma delimited list of groups"
     return ["_".join(faker.words()) for _ in range(num_groups)]
 
 
-@fixture(name="n_rows")
-def sheet_nrows(faker: Faker) -> int:
-    return faker.random_int(1, 100)
+# the fake sheets are only read by the tests, so they are generated once per session
+# from seeded sources to keep them the same between runs
+@fixture(scope="session", autouse=True)
+def seed_random() -> None:
+    random.seed(0)
 
 
-@fixture
-def faked_users(faker: Faker, n_rows: int) -> pd.DataFrame:
+@fixture(scope="session")
+def sheet_faker() -> Faker:
+    fake = Faker()
+    fake.seed_instance(0)
+    return fake
+
+
+@fixture(name="n_rows", scope="session")
+def sheet_nrows(sheet_faker: Faker) -> int:
+    return sheet_faker.random_int(1, 100)
+
+
+@fixture(scope="session")
+def faked_users(sheet_faker: Faker, n_rows: int) -> pd.DataFrame:
     users_data: Dict[str, list[str | None]] = {
-        "UPI": [fake_upi(faker) for _ in range(n_rows)],
-        "Identifier": [random.choice([str(faker.binary), None]) for _ in range(n_rows)],
-        "Pubkey": [random.choice([str(faker.sha1()), None]) for _ in range(n_rows)],
-        "Name": [random.choice([faker.name(), None]) for _ in range(n_rows)],
-        "Email": [random.choice([faker.email(), None]) for _ in range(n_rows)],
+        "UPI": fake_upis(n_rows),
+        "Identifier": optional([str(sheet_faker.binary) for _ in range(n_rows)]),
+        "Pubkey": optional([str(sheet_faker.sha1()) for _ in range(n_rows)]),
+        "Name": optional([sheet_faker.name() for _ in range(n_rows)]),
+        "Email": optional([sheet_faker.email() for _ in range(n_rows)]),
     }
     return pd.DataFrame(users_data)
 
 
-@fixture
-def faked_groups(faker: Faker, n_rows: int) -> pd.DataFrame:
+@fixture(scope="session")
+def faked_groups(sheet_faker: Faker, n_rows: int) -> pd.DataFrame:
     groups_data: Dict[str, list[str | None] | list[str]] = {
-        "Name": fake_groups_list(faker, n_rows),
-        "is_owner": [
-            random.choice([str(faker.boolean()), None]) for _ in range(n_rows)
-        ],
-        "see_sensitive": [
-            random.choice([str(faker.boolean()), None]) for _ in range(n_rows)
-        ],
-        "can_download": [
-            random.choice([str(faker.boolean()), None]) for _ in range(n_rows)
-        ],
+        "Name": fake_groups_list(sheet_faker, n_rows),
+        "is_owner": optional([str(sheet_faker.boolean()) for _ in range(n_rows)]),
+        "see_sensitive": optional([str(sheet_faker.boolean()) for _ in range(n_rows)]),
+        "can_download": optional([str(sheet_faker.boolean()) for _ in range(n_rows)]),
     }
     return pd.DataFrame(groups_data)
 
 
-@fixture
+@fixture(scope="session")
 def faked_samples(
-    faker: Faker, n_rows: int, faked_groups: pd.DataFrame
+    sheet_faker: Faker, n_rows: int, faked_groups: pd.DataFrame
 ) -> pd.DataFrame:
-    available_groups = faked_groups["Name"].to_list()
+    groups = faked_groups["Name"].to_list()
+    # one draw marks which groups every row keeps, and each row always keeps one
+    n_groups = len(groups)
+    kept = random.choices((True, False), k=n_rows * n_groups)
+    always_kept = random.choices(range(n_groups), k=n_rows)
+    group_membership = [
+        [
+            group
+            for index, group in enumerate(groups)
+            if index == always or kept[row * n_groups + index]
+        ]
+        for row, always in enumerate(always_kept)
+    ]
     samples_data: Dict[str, list[str | None]] = {
-        "Unique identifier": [faker.bothify("######") for _ in range(n_rows)],
-        "User": [fake_upi(faker) for _ in range(n_rows)],
-        "Sample type text": [
-            random.choice([" ".join(faker.words()), None]) for _ in range(n_rows)
-        ],
-        "Sample type code": [
-            random.choice([faker.bothify("##"), None]) for _ in range(n_rows)
-        ],
-        "Disease type text from ICD11": [
-            random.choice([" ".join(faker.words()), None]) for _ in range(n_rows)
-        ],
-        "Disease type ICD11 code": [
-            random.choice([fake_icd11(faker), None]) for _ in range(n_rows)
-        ],
-        "Other sample information": [
-            random.choice([" ".join(faker.words()), None]) for _ in range(n_rows)
-        ],
-        "Sample anatomical site text from ICD11": [
-            random.choice([" ".join(faker.words()), None]) for _ in range(n_rows)
-        ],
-        "Sample anatomical site ICD11 code": [
-            random.choice([fake_icd11(faker), None]) for _ in range(n_rows)
-        ],
-        "Histological diagnosis detail text from ICD11": [
-            random.choice([" ".join(faker.words()), None]) for _ in range(n_rows)
-        ],
-        "Histological diagnosis detail code from ICD11": [
-            random.choice([fake_icd11(faker), None]) for _ in range(n_rows)
-        ],
+        "Unique identifier": batch_bothify("######", n_rows),
+        "User": fake_upis(n_rows),
+        "Sample type text": optional(
+            [" ".join(sheet_faker.words()) for _ in range(n_rows)]
+        ),
+        "Sample type code": optional(batch_bothify("##", n_rows)),
+        "Disease type text from ICD11": optional(
+            [" ".join(sheet_faker.words()) for _ in range(n_rows)]
+        ),
+        "Disease type ICD11 code": optional(fake_icd11s(n_rows)),
+        "Other sample information": optional(
+            [" ".join(sheet_faker.words()) for _ in range(n_rows)]
+        ),
+        "Sample anatomical site text from ICD11": optional(
+            [" ".join(sheet_faker.words()) for _ in range(n_rows)]
+        ),
+        "Sample anatomical site ICD11 code": optional(fake_icd11s(n_rows)),
+        "Histological diagnosis detail text from ICD11": optional(
+            [" ".join(sheet_faker.words()) for _ in range(n_rows)]
+        ),
+        "Histological diagnosis detail code from ICD11": optional(fake_icd11s(n_rows)),
         "Tissue processing": [
-            random.choice([faker.bothify("?????"), " ".join(faker.words()), None])
-            for _ in range(n_rows)
-        ],
-        "Analyte": [
-            random.choice([faker.random_letter(), None]) for _ in range(n_rows)
-        ],
-        "Portion": [
-            random.choice([str(faker.random_int(min=0, max=99)), None])
-            for _ in range(n_rows)
-        ],
-        "Project": [
-            faker.bothify(text="??#######", letters="abcdefghijklmnopqrstuvwxyz")
-            for _ in range(n_rows)
-        ],
-        "Participant": [
-            faker.bothify(text="?####", letters="ABCDEFGHIJKLMNOPQRSTUVWXYZ")
-            for _ in range(n_rows)
-        ],
-        "Groups": [
             random.choice(
-                [
-                    ",".join(
-                        random.sample(
-                            population=available_groups,
-                            k=random.randint(1, len(faked_groups["Name"])),
-                        )
-                    ),
-                    None,
-                ]
+                [sheet_faker.bothify("?????"), " ".join(sheet_faker.words()), None]
             )
             for _ in range(n_rows)
         ],
+        "Analyte": optional([sheet_faker.random_letter() for _ in range(n_rows)]),
+        "Portion": optional(
+            [str(sheet_faker.random_int(min=0, max=99)) for _ in range(n_rows)]
+        ),
+        "Project": batch_bothify("??#######", n_rows, string.ascii_lowercase),
+        "Participant": batch_bothify("?####", n_rows, string.ascii_uppercase),
+        "Groups": optional([",".join(row) for row in group_membership]),
     }
 
-    def _consturct_sample_id(row_index: int) -> str:
-        sample_names = [
-            samples_data["Unique identifier"][row_index],
-            samples_data["Project"][row_index],
-            samples_data["Sample type code"][row_index],
-            samples_data["Disease type ICD11 code"][row_index],
-            samples_data["Analyte"][row_index],
-            samples_data["Participant"][row_index],
-        ]
-
-        sample_name_list: List[str] = [
-            str(sample_element)
-            for sample_element in sample_names
-            if sample_element is not None
+    samples = pd.DataFrame(samples_data)
+    # the sample name joins the filled in parts of each row
+    sample_name_parts = samples[
+        [
+            "Unique identifier",
+            "Project",
+            "Sample type code",
+            "Disease type ICD11 code",
+            "Analyte",
+            "Participant",
         ]
-        return "-".join(sample_name_list) if sample_name_list else ""
-
-    samples_data["Sample name"] = [_consturct_sample_id(i) for i in range(n_rows)]
-
-    return pd.DataFrame(samples_data)
+    ]
+    samples["Sample name"] = (
+        sample_name_parts.stack(future_stack=True)
+        .dropna()
+        .groupby(level=0)
+        .agg("-".join)
+        .reindex(samples.index, fill_value="")
+    )
+    return samples
 
 
-@fixture
-def faked_projects(faker: Faker, n_rows: int) -> pd.DataFrame:
+@fixture(scope="session")
+def faked_projects(sheet_faker: Faker, n_rows: int) -> pd.DataFrame:
     projects_data: Dict[str, list[str | None]] = {
-        "Project name": [f"{faker.word()}_{faker.color()}" for _ in range(n_rows)],
-        "Project code": [
-            faker.bothify(text="??#######", letters="abcdefghijklmnopqrstuvwxyz")
-            for _ in range(n_rows)
-        ],
-        "Project PI": [fake_upi(faker) for _ in range(n_rows)],
-        "Ethics Approval ID": [
-            random.choice([str(faker.random_number()), None]) for _ in range(n_rows)
+        "Project name": [
+            f"{sheet_faker.word()}_{sheet_faker.color()}" for _ in range(n_rows)
         ],
-        "Ethics Approval Designation": [
-            random.choice([faker.url(), None]) for _ in range(n_rows)
-        ],
-        "description": [random.choice([faker.sentence(), None]) for _ in range(n_rows)],
-        "Patient Consent Designation": [faker.word() for _ in range(n_rows)],
+        "Project code": batch_bothify("??#######", n_rows, string.ascii_lowercase),
+        "Project PI": fake_upis(n_rows),
+        "Ethics Approval ID": optional(
+            [str(sheet_faker.random_number()) for _ in range(n_rows)]
+        ),
+        "Ethics Approval Designation": optional(
+            [sheet_faker.url() for _ in range(n_rows)]
+        ),
+        "description": optional([sheet_faker.sentence() for _ in range(n_rows)]),
+        "Patient Consent Designation": [sheet_faker.word() for _ in range(n_rows)],
     }
     return pd.DataFrame(projects_data)
 
 
-@fixture
+@fixture(scope="session")
 def faked_participants(
-    faker: Faker, n_rows: int, faked_samples: pd.DataFrame
+    sheet_faker: Faker, n_rows: int, faked_samples: pd.DataFrame
 ) -> pd.DataFrame:
     n_rows = faked_samples.shape[0]
     participants_data: Dict[str, list[str | None]] = {
-        "Participant: Code": [
-            faker.bothify(text="?####", letters="ABCDEFGHIJKLMNOPQRSTUVWXYZ")
-            for _ in range(n_rows)
-        ],
-        "Participant aliases": [
-            random.choice([str(faker.random_int(min=0, max=99)), None])
-            for _ in range(n_rows)
-        ],
-        "Participant Date of birth": [
-            random.choice([str(faker.date_of_birth()), None]) for _ in range(n_rows)
-        ],
+        "Participant: Code": batch_bothify("?####", n_rows, string.ascii_uppercase),
+        "Participant aliases": optional(
+            [str(sheet_faker.random_int(min=0, max=99)) for _ in range(n_rows)]
+        ),
+        "Participant Date of birth": optional(
+            [str(sheet_faker.date_of_birth()) for _ in range(n_rows)]
+        ),
         "Participant NHI number": [
-            fake_national_health_index(faker) for _ in range(n_rows)
-        ],
-        "Participant Sex": [
-            random.choice([faker.passport_gender(), None]) for _ in range(n_rows)
-        ],
-        "Participant Ethnicity": [
-            random.choice([str(faker.country()), None]) for _ in range(n_rows)
-        ],
-        "Project": [
-            faker.bothify(text="??#######", letters="abcdefghijklmnopqrstuvwxyz")
-            for _ in range(n_rows)
+            fake_national_health_index(sheet_faker) for _ in range(n_rows)
         ],
+        "Participant Sex": optional(
+            [sheet_faker.passport_gender() for _ in range(n_rows)]
+        ),
+        "Participant Ethnicity": optional(
+            [str(sheet_faker.country()) for _ in range(n_rows)]
+        ),
+        "Project": batch_bothify("??#######", n_rows, string.ascii_lowercase),
     }
     participants_data["Participant: Code"] = [
         faked_samples["Participant"][i] for i in range(n_rows)
@@ -270,50 +279,39 @@ def faked_participants(
     return pd.DataFrame(participants_data)
 
 
-@fixture
+@fixture(scope="session")
 def faked_datasets(
-    faker: Faker, n_rows: int, faked_samples: pd.DataFrame
+    sheet_faker: Faker, n_rows: int, faked_samples: pd.DataFrame
 ) -> pd.DataFrame:
     n_rows = faked_samples.shape[0]
     datasets_data: Dict[str, list[str | None]] = {
         "Directory": ["test_data/" for _ in range(n_rows)],
-        "Dataset Name": [
-            faker.bothify(text="?????? ####### ???##") for _ in range(n_rows)
-        ],
-        "Analysis platform": [
-            random.choice([" ".join(faker.words()), None]) for _ in range(n_rows)
-        ],
-        "Analysis code": [
-            random.choice([faker.random_letter(), None]) for _ in range(n_rows)
-        ],
-        "Instrument": [
-            random.choice([" ".join(faker.words()), None]) for _ in range(n_rows)
-        ],
-        "Center": [
-            random.choice([" ".join(faker.city()), None]) for _ in range(n_rows)
-        ],
-        "Sample code from Centre": [faker.bothify(text="?###") for _ in range(n_rows)],
-        "Crate Children": [str(faker.boolean()) for _ in range(n_rows)],
+        "Dataset Name": batch_bothify("?????? ####### ???##", n_rows),
+        "Analysis platform": optional(
+            [" ".join(sheet_faker.words()) for _ in range(n_rows)]
+        ),
+        "Analysis code": optional([sheet_faker.random_letter() for _ in range(n_rows)]),
+        "Instrument": optional([" ".join(sheet_faker.words()) for _ in range(n_rows)]),
+        "Center": optional([" ".join(sheet_faker.city()) for _ in range(n_rows)]),
+        "Sample code from Centre": batch_bothify("?###", n_rows),
+        "Crate Children": [str(sheet_faker.boolean()) for _ in range(n_rows)],
     }
     datasets_data["Sample"] = [faked_samples["Sample name"][i] for i in range(n_rows)]
     return pd.DataFrame(datasets_data)
 
 
-@fixture
-def faked_datafiles(faker: Faker, n_rows: int) -> pd.DataFrame:
-    n_rows = faker.random_int(1, 100)
+@fixture(scope="session")
+def faked_datafiles(sheet_faker: Faker, n_rows: int) -> pd.DataFrame:
+    n_rows = sheet_faker.random_int(1, 100)
     datafiles_data: Dict[str, list[str | None]] = {
-        "Filepath": [f"test_data/{faker.file_extension}" for _ in range(n_rows)],
+        "Filepath": [f"test_data/{sheet_faker.file_extension}" for _ in range(n_rows)],
         "Dataset": ["test_data/" for _ in range(n_rows)],
-        "Dataset Name": [
-            faker.bothify(text="?????? ####### ???##") for _ in range(n_rows)
-        ],
+        "Dataset Name": batch_bothify("?????? ####### ???##", n_rows),
         "Genome": [
-            random.choice([faker.bothify("##??"), None, "NA"]) for _ in range(n_rows)
-        ],
-        "Description": [
-            random.choice([" ".join(faker.words()), None]) for _ in range(n_rows)
+            random.choice([sheet_faker.bothify("##??"), None, "NA"])
+            for _ in range(n_rows)
         ],
+        "Description": optional([" ".join(sheet_faker.words()) for _ in range(n_rows)]),
     }
     return pd.DataFrame(datafiles_data)
 
@@ -324,6 +322,13 @@ def tmpdir(tmpdir: pathlib.Path) -> pathlib.Path:
     return pathlib.Path(tmpdir)
 
 
+@fixture(autouse=True)
+def schema_cache_dir(tmpdir: pathlib.Path, monkeypatch: MonkeyPatch) -> pathlib.Path:
+    d = tmpdir / "schema_cache"
+    monkeypatch.setattr(MetadataHanlder, "schema_cache_dir", d)
+    return d
+
+
 @fixture
 def test_data_dir(tmpdir: pathlib.Path) -> pathlib.Path:
     d = tmpdir / TEST_DATA_NAME
@@ -116,6 +116,57 @@ def test_mytardis_rest_agent_get_fail() -> None:
         mt_rest_agent.mytardis_api_request("GET", "https://bad_url.com")
 
 
+@responses.activate
+def test_create_person_object_cached(auth: AuthConfig) -> None:
+    """Test that a UPI is only requested once and failed lookups are not cached
+
+    Args:
+        auth (AuthConfig): a test authentication config
+    """
+    mt_rest_agent = MyTardisRestAgent(auth, CONNECTION__HOSTNAME, None, False)
+    url = mt_rest_agent.api_template + "user/?username=abcd123"
+    responses.add(responses.GET, url, status=500)
+    assert mt_rest_agent.create_person_object("abcd123").name == "abcd123"
+
+    responses.replace(
+        responses.GET,
+        url,
+        status=200,
+        json={"objects": [{"first_name": "Test", "last_name": "User"}]},
+    )
+    person = mt_rest_agent.create_person_object("abcd123")
+    assert person.name == "Test User"
+    assert mt_rest_agent.create_person_object("abcd123") is person
+    assert len(responses.calls) == 2
+
+    mt_rest_agent.clear_cache()
+    assert mt_rest_agent.create_person_object("abcd123") is not person
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_prefetch_people(auth: AuthConfig) -> None:
+    """Test that prefetched UPIs are looked up once and then served from the cache
+
+    Args:
+        auth (AuthConfig): a test authentication config
+    """
+    mt_rest_agent = MyTardisRestAgent(auth, CONNECTION__HOSTNAME, None, False)
+    upis = ["abcd123", "efgh456"]
+    for upi in upis:
+        responses.add(
+            responses.GET,
+            mt_rest_agent.api_template + "user/?username=" + upi,
+            status=200,
+            json={"objects": [{"first_name": upi}]},
+        )
+    mt_rest_agent.prefetch_people(upis + upis)
+    assert len(responses.calls) == 2
+    for upi in upis:
+        assert mt_rest_agent.create_person_object(upi).name == upi
+    assert len(responses.calls) == 2
+
+
 @responses.activate
 def test_icd_11_api_get_token() -> None:
     """Test getting a token for the ICD11 agent"""
@@ -0,0 +1,22 @@
+"""Tests for the logging helpers"""
+
+import logging
+from pathlib import Path
+
+from src.utils.log_utils import init_logging
+
+
+def test_init_logging_replaces_handlers(tmp_path: Path) -> None:
+    """Repeated calls replace the handlers from the previous call instead of stacking"""
+    root = logging.getLogger()
+    existing = list(root.handlers)
+    init_logging(file_name=str(tmp_path / "first.log"))
+    init_logging(file_name=str(tmp_path / "second.log"))
+    added = [handler for handler in root.handlers if handler not in existing]
+    assert len(added) == 2
+    logging.getLogger(__name__).info("logged once")
+    assert (tmp_path / "second.log").read_text() == "[INFO]: logged once\n"
+    assert (tmp_path / "first.log").read_text() == ""
+    for handler in added:
+        root.removeHandler(handler)
+        handler.close()
@@ -9,11 +9,14 @@ from mytardis_rocrate_builder.rocrate_dataclasses.rocrate_dataclasses import (
     MTMetadata,
     Project,
 )
+from requests.exceptions import RequestException
+from responses import matchers
 
 from src.metadata_extraction.metadata_extraction import (
     MetadataHanlder,
     MetadataSchema,
     create_metadata_objects,
+    get_metadata_type,
 )
 from src.mt_api.api_consts import CONNECTION__HOSTNAME
 from src.mt_api.apiconfigs import AuthConfig, MyTardisRestAgent
@@ -51,6 +54,232 @@ def test_retreive_schema(
     assert schemas[MtObject.PROJECT] == test_schema
 
 
+@responses.activate
+def test_schema_disk_cache(
+    auth: AuthConfig,
+    test_metadata_response: Dict[str, Any],
+    test_schema_namespace: str,
+    test_schema: Dict[str, Any],
+) -> None:
+    """Test that schemas are cached on disk and re-requested once stale
+
+    Args:
+        auth (AuthConfig): test authentication config
+        test_metadata_response (Dict[str, Any]): test api response for a metadata schema
+        test_schema_namespace (str): test namespace that corresponds to the test metadata
+        test_schema (Dict[str, Any]): the schema retreived
+    """
+    mt_rest_agent = MyTardisRestAgent(auth, CONNECTION__HOSTNAME, None, False)
+    schema_stub = "schema/?namespace="
+    responses.add(
+        responses.GET,
+        mt_rest_agent.api_template + schema_stub + test_schema_namespace,
+        status=200,
+        json=test_metadata_response,
+    )
+    schema_namespaces = {MtObject.PROJECT: test_schema_namespace}
+    handler = MetadataHanlder(
+        api_agent=mt_rest_agent, schema_namespaces=schema_namespaces
+    )
+    assert len(responses.calls) == 0
+    handler.get_mtobj_schema(MtObject.PROJECT)
+    assert len(responses.calls) == 1
+
+    handler = MetadataHanlder(
+        api_agent=mt_rest_agent, schema_namespaces=schema_namespaces
+    )
+    assert handler.get_mtobj_schema(MtObject.PROJECT) == test_schema
+    assert len(responses.calls) == 1
+
+    handler.cache_ttl_seconds = -1
+    schemas = handler.request_metadata_dicts(schema_namespaces=schema_namespaces)
+    assert len(responses.calls) == 2
+    assert schemas[MtObject.PROJECT] == test_schema
+
+
+@responses.activate
+def test_schema_revalidated_with_etag(
+    auth: AuthConfig,
+    test_metadata_response: Dict[str, Any],
+    test_schema_namespace: str,
+    test_schema: Dict[str, Any],
+) -> None:
+    """Test that a stale cached schema is revalidated and reused if unchanged
+
+    Args:
+        auth (AuthConfig): test authentication config
+        test_metadata_response (Dict[str, Any]): test api response for a metadata schema
+        test_schema_namespace (str): test namespace that corresponds to the test metadata
+        test_schema (Dict[str, Any]): the schema retreived
+    """
+    mt_rest_agent = MyTardisRestAgent(auth, CONNECTION__HOSTNAME, None, False)
+    schema_url = (
+        mt_rest_agent.api_template + "schema/?namespace=" + test_schema_namespace
+    )
+    responses.add(
+        responses.GET,
+        schema_url,
+        status=200,
+        json=test_metadata_response,
+        headers={"ETag": '"v1"'},
+    )
+    schema_namespaces = {MtObject.PROJECT: test_schema_namespace}
+    handler = MetadataHanlder(
+        api_agent=mt_rest_agent, schema_namespaces=schema_namespaces
+    )
+    handler.request_metadata_schema(test_schema_namespace)
+
+    responses.replace(
+        responses.GET,
+        schema_url,
+        status=304,
+        match=[matchers.header_matcher({"If-None-Match": '"v1"'})],
+    )
+    handler.cache_ttl_seconds = -1
+    assert handler.request_metadata_schema(test_schema_namespace) == test_schema
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_stale_schema_used_when_revalidation_fails(
+    auth: AuthConfig,
+    test_metadata_response: Dict[str, Any],
+    test_schema_namespace: str,
+    test_schema: Dict[str, Any],
+) -> None:
+    """Test that a stale cached schema is still used if MyTardis can't be reached
+
+    Args:
+        auth (AuthConfig): test authentication config
+        test_metadata_response (Dict[str, Any]): test api response for a metadata schema
+        test_schema_namespace (str): test namespace that corresponds to the test metadata
+        test_schema (Dict[str, Any]): the schema retreived
+    """
+    mt_rest_agent = MyTardisRestAgent(auth, CONNECTION__HOSTNAME, None, False)
+    schema_url = (
+        mt_rest_agent.api_template + "schema/?namespace=" + test_schema_namespace
+    )
+    responses.add(
+        responses.GET,
+        schema_url,
+        status=200,
+        json=test_metadata_response,
+    )
+    handler = MetadataHanlder(
+        api_agent=mt_rest_agent,
+        schema_namespaces={MtObject.PROJECT: test_schema_namespace},
+    )
+    handler.request_metadata_schema(test_schema_namespace)
+
+    responses.replace(
+        responses.GET, schema_url, body=RequestException("network unreachable")
+    )
+    handler.cache_ttl_seconds = -1
+    assert handler.request_metadata_schema(test_schema_namespace) == test_schema
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_shared_namespace_requested_once(
+    auth: AuthConfig,
+    test_metadata_response: Dict[str, Any],
+    test_schema_namespace: str,
+    test_schema: Dict[str, Any],
+) -> None:
+    """Test that objects sharing a schema namespace only request it once
+
+    Args:
+        auth (AuthConfig): test authentication config
+        test_metadata_response (Dict[str, Any]): test api response for a metadata schema
+        test_schema_namespace (str): test namespace that corresponds to the test metadata
+        test_schema (Dict[str, Any]): the schema retreived
+    """
+    mt_rest_agent = MyTardisRestAgent(auth, CONNECTION__HOSTNAME, None, False)
+    schema_stub = "schema/?namespace="
+    responses.add(
+        responses.GET,
+        mt_rest_agent.api_template + schema_stub + test_schema_namespace,
+        status=200,
+        json=test_metadata_response,
+    )
+    schema_namespaces = {
+        MtObject.DATASET: test_schema_namespace,
+        MtObject.DATAFILE: test_schema_namespace,
+    }
+    handler = MetadataHanlder(
+        api_agent=mt_rest_agent, schema_namespaces=schema_namespaces
+    )
+    handler.request_metadata_dicts(schema_namespaces)
+    assert len(responses.calls) == 1
+    assert handler.metadata_schemas[MtObject.DATASET] == test_schema
+    assert handler.metadata_schemas[MtObject.DATAFILE] == test_schema
+
+
+@responses.activate
+def test_prefetch_schemas(
+    auth: AuthConfig,
+    test_metadata_response: Dict[str, Any],
+    test_schema_namespace: str,
+    test_schema: Dict[str, Any],
+) -> None:
+    """Test that prefetching only requests schemas that have a namespace and aren't loaded
+
+    Args:
+        auth (AuthConfig): test authentication config
+        test_metadata_response (Dict[str, Any]): test api response for a metadata schema
+        test_schema_namespace (str): test namespace that corresponds to the test metadata
+        test_schema (Dict[str, Any]): the schema retreived
+    """
+    mt_rest_agent = MyTardisRestAgent(auth, CONNECTION__HOSTNAME, None, False)
+    schema_stub = "schema/?namespace="
+    responses.add(
+        responses.GET,
+        mt_rest_agent.api_template + schema_stub + test_schema_namespace,
+        status=200,
+        json=test_metadata_response,
+    )
+    schema_namespaces = {
+        MtObject.PROJECT: "",
+        MtObject.DATASET: test_schema_namespace,
+    }
+    handler = MetadataHanlder(
+        api_agent=mt_rest_agent, schema_namespaces=schema_namespaces
+    )
+    handler.prefetch_schemas()
+    handler.prefetch_schemas()
+    assert len(responses.calls) == 1
+    assert handler.get_mtobj_schema(MtObject.DATASET) == test_schema
+    assert not handler.get_mtobj_schema(MtObject.PROJECT)
+    assert len(responses.calls) == 1
+
+
+def test_get_metadata_type() -> None:
+    """Test looking up MyTardis metadata types, including out of range values"""
+    assert get_metadata_type(1) == "NUMERIC"
+    assert get_metadata_type(2) == "STRING"
+    assert get_metadata_type(8) == "JSON"
+    assert get_metadata_type(0) == "STRING"
+    assert get_metadata_type(9) == "STRING"
+    assert get_metadata_type(-1) == "STRING"
+
+
+def test_schema_null_data_type() -> None:
+    """Test schema fields without a data type default to strings"""
+    schema = MetadataSchema(
+        schema={
+            "untyped": {"name": "untyped", "data_type": None, "sensitive": True},
+            "missing": {"name": "missing"},
+            "numeric": {"name": "numeric", "data_type": 1},
+        },
+        url="",
+    )
+    assert schema.fields == {
+        "untyped": ("STRING", True),
+        "missing": ("STRING", False),
+        "numeric": ("NUMERIC", False),
+    }
+
+
 def test_create_metadata_objects(
     faked_projects_row: pd.Series,
     test_parent_project: Project,
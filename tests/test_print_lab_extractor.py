@@ -232,6 +232,30 @@ def test_faked_samples_extraction(  # pylint: disable=too-many-locals
         assert test_print_lab_builder.crate.dereference(acl.parent.roc_id) is not None
 
 
+def test_medical_conditions_looked_up_once() -> None:
+    """Conditions repeated across rows are requested from the ICD-11 once"""
+    ICD_11_Api_Agent = MagicMock()
+    update_condition = ICD_11_Api_Agent.return_value.update_medial_entity_from_ICD11
+    update_condition.side_effect = lambda medical_condition: medical_condition
+    extractor = PrintLabExtractor(
+        api_agent=MagicMock(),
+        schemas=None,
+        collect_all=False,
+        pubkey_fingerprints=None,
+        icd_11_agent=ICD_11_Api_Agent(),
+    )
+    conditions: Dict[Any, MedicalCondition] = {}
+    rows = [{"code": "2C25.0", "text": "row text"} for _ in range(3)]
+    parsed = [
+        extractor._parse_medical_condition(row, "code", "text", conditions=conditions)
+        for row in rows
+    ]
+    assert parsed[0] is not None
+    assert parsed[0] is parsed[1] is parsed[2]
+    assert update_condition.call_count == 1
+    assert all(row["text"] == parsed[0].code_text for row in rows)
+
+
 def test_faked_project_extraction(
     faked_projects: pd.DataFrame, test_print_lab_builder: PrintLabROBuilder
 ) -> None: